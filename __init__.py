@@ -1,4 +1,18 @@
-from .artifact_capture import capture_artifacts
-from .report_generator import generate_report
+from importlib import import_module
 
-__all__ = ["capture_artifacts", "generate_report"]
+# Re-exports resolve lazily so importing one utility (e.g. fast_json)
+# doesn't pull in Playwright or aiofiles
+_EXPORTS = {
+    "capture_artifacts": ".artifact_capture",
+    "generate_report": ".report_generator",
+    "LLMCache": ".llm_cache",
+    "FileBackend": ".llm_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
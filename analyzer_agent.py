@@ -1,15 +1,42 @@
 # backend/agents/analyzer_agent.py
 import os
-import json
+import re
 import logging
-from typing import List, Dict, Any, Tuple
+import asyncio
+from collections import Counter
+from typing import List, Dict, Any, Tuple, Optional
+
+import aiofiles
+import httpx
 
 from backend.utils.report_generator import generate_report
-from langchain_community.chat_models import ChatOpenAI
+from backend.utils import fast_json
+from backend.utils.llm_cache import LLMCache, FileBackend, cached_ainvoke
+from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
 logger = logging.getLogger("AnalyzerAgent")
 
+_ERROR_RE = re.compile(rb"ERROR", re.IGNORECASE)
+_CHUNK_SIZE = 65536
+_VERDICTS = {"passed", "failed", "flaky"}
+
+
+async def _has_error(path: str) -> bool:
+    """
+    Case-insensitive scan for "error" in a log file, read in 64KB chunks without
+    blocking the event loop. Stops at the first match.
+    """
+    tail = b""
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(_CHUNK_SIZE):
+            # Keep the last few bytes so a match split across chunks is still found
+            window = tail + chunk
+            if _ERROR_RE.search(window):
+                return True
+            tail = window[-4:]
+    return False
+
 
 class AnalyzerAgent:
     """
@@ -17,7 +44,14 @@ class AnalyzerAgent:
     performs reproducibility checks, auto-determines verdicts, and generates a structured JSON report.
     """
 
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.2):
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.2,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         # --- Directly set your API key here ---
         self.api_key = ""
         if not self.api_key:
@@ -29,7 +63,10 @@ class AnalyzerAgent:
             model=model_name,
             temperature=temperature,
             api_key=self.api_key,
+            http_async_client=http_client,
         )
+        self.cache = cache or FileBackend()
+        self.use_cache = use_cache
 
     async def analyze_and_write_report(
         self, run_id: str, results: List[Dict[str, Any]]
@@ -58,9 +95,7 @@ class AnalyzerAgent:
             if verdict == "pending":
                 logs_path = artifacts.get("logs")
                 if logs_path and os.path.exists(logs_path):
-                    with open(logs_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        verdict = "failed" if "ERROR" in content.upper() else "passed"
+                    verdict = "failed" if await _has_error(logs_path) else "passed"
                 else:
                     verdict = "failed"  # treat missing logs as failure
 
@@ -82,58 +117,38 @@ class AnalyzerAgent:
                 }
             )
 
-        # --- Summarize results ---
-        summary = {"total": len(analyzed_tests), "passed": 0, "failed": 0, "flaky": 0}
-        for t in analyzed_tests:
-            if t["verdict"] == "passed":
-                summary["passed"] += 1
-            elif t["verdict"] == "failed":
-                summary["failed"] += 1
-
-        # --- Optional: LLM-based deep analysis ---
+        # --- Optional: LLM-based deep analysis (batched), only for tests that didn't pass ---
         try:
-            if analyzed_tests:
-                prompt = ChatPromptTemplate.from_messages(
-                    [
-                        (
-                            "system",
-                            "You are a QA report analyzer for the site play.ezygamers.com."
-                        ),
-                        (
-                            "user",
-                            f"Here are the execution results:\n{analyzed_tests}\n\n"
-                            "Validate correctness, reproducibility, and identify likely causes of failure. "
-                            "Output structured JSON with 'summary' and 'tests'."
-                        ),
-                    ]
-                )
-
-                chain = prompt | self.llm
-                response = await chain.ainvoke({})
-                text = response.content
-
-                smart_report = json.loads(text)
-                if isinstance(smart_report, dict) and "tests" in smart_report:
-                    analyzed_tests = smart_report["tests"]
-                    summary = smart_report.get("summary", summary)
-                    logger.info("AnalyzerAgent used LLM for report")
+            to_review = [t for t in analyzed_tests if t["verdict"] != "passed"]
+            if to_review:
+                reviewed = {t["test_id"]: t for t in await self._batch_analyze(to_review)}
+                analyzed_tests = [reviewed.get(t["test_id"], t) for t in analyzed_tests]
+                logger.info("AnalyzerAgent used LLM for %d non-passing tests", len(to_review))
+            else:
+                logger.info("AnalyzerAgent skipping LLM analysis: all tests passed")
 
         except Exception as e:
             logger.error("AnalyzerAgent LLM analysis failed: %s", e)
             logger.warning("Falling back to local analysis results")
 
+        # --- Summarize results ---
+        verdicts = Counter(t["verdict"] for t in analyzed_tests)
+        summary = {
+            "total": len(analyzed_tests),
+            "passed": verdicts.get("passed", 0),
+            "failed": verdicts.get("failed", 0),
+            "flaky": verdicts.get("flaky", 0),
+        }
+
         # --- Save report ---
         artifacts_map = {t["test_id"]: t["artifacts"] for t in analyzed_tests}
-        report_path = generate_report(
+        report_path, _ = await generate_report(
             run_id=run_id,
             test_results=analyzed_tests,
             artifacts=artifacts_map,
             notes="Generated by AnalyzerAgent for play.ezygamers.com",
         )
 
-        with open(report_path, "r", encoding="utf-8") as fh:
-            report = json.load(fh)
-
         logger.info(
             "AnalyzerAgent wrote report to %s | total=%d, passed=%d, failed=%d",
             report_path,
@@ -142,3 +157,93 @@ class AnalyzerAgent:
             summary["failed"],
         )
         return report_path, {"summary": summary, "tests": analyzed_tests}
+
+    async def _batch_analyze(
+        self, tests: List[Dict[str, Any]], batch_size: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the LLM deep analysis over tests in batches of batch_size, one request per batch.
+        The shared system/instruction tokens are sent once per batch instead of once per test.
+        :param tests: Locally analyzed tests
+        :param batch_size: Number of tests per LLM request
+        :return: Tests with verdict/notes/root_cause merged from the LLM by index
+        """
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    "You are a QA report analyzer for the site play.ezygamers.com."
+                ),
+                (
+                    "user",
+                    "Here are the execution results, numbered [1..K]:\n{batch}\n\n"
+                    "Analyze tests [1..K]. Validate correctness, reproducibility, and identify "
+                    "likely causes of failure. Return ONLY a JSON array with one entry per test, "
+                    "echoing its index and test_id: "
+                    '[{{"index": ..., "test_id": ..., "verdict": "passed|failed|flaky", '
+                    '"notes": ..., "root_cause": ...}}, ...]'
+                ),
+            ]
+        )
+        # Only send the fields the model needs; paths, reproducibility and notes are noise
+        slim = [
+            {
+                "test_id": t["test_id"],
+                "verdict": t["verdict"],
+                "error": (t.get("artifacts") or {}).get("error"),
+            }
+            for t in tests
+        ]
+        batches = [slim[i:i + batch_size] for i in range(0, len(slim), batch_size)]
+        responses = await asyncio.gather(
+            *[
+                cached_ainvoke(
+                    self.llm,
+                    prompt,
+                    {"batch": fast_json.dumps([{"index": i + 1, **t} for i, t in enumerate(b)])},
+                    cache=self.cache,
+                    use_cache=self.use_cache,
+                    parse=lambda text: fast_json.extract_json(text, expected=list),
+                )
+                for b in batches
+            ],
+            return_exceptions=True,
+        )
+
+        # A failed or unparseable batch keeps its local verdicts; the other batches still merge.
+        # Replies are matched by their 1-based index within the batch, falling back to
+        # str(test_id) since the model may echo 1 as "1".
+        by_pos: Dict[int, Dict[str, Any]] = {}
+        for n, items in enumerate(responses, start=1):
+            if isinstance(items, BaseException):
+                logger.error("AnalyzerAgent LLM batch %d/%d failed: %s", n, len(batches), items)
+                continue
+            offset = (n - 1) * batch_size
+            batch = batches[n - 1]
+            pos_by_id = {str(t["test_id"]): offset + i for i, t in enumerate(batch)}
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                try:
+                    index = int(item.get("index"))
+                except (TypeError, ValueError):
+                    index = 0
+                if 1 <= index <= len(batch):
+                    by_pos[offset + index - 1] = item
+                elif str(item.get("test_id")) in pos_by_id:
+                    by_pos[pos_by_id[str(item["test_id"])]] = item
+
+        merged: List[Dict[str, Any]] = []
+        for pos, t in enumerate(tests):
+            item = by_pos.get(pos)
+            if item:
+                # Only trust a verdict the summary can count; anything else keeps the local one
+                verdict = item.get("verdict")
+                t = {
+                    **t,
+                    "verdict": verdict if verdict in _VERDICTS else t["verdict"],
+                    "notes": item.get("notes", t["notes"]),
+                    "root_cause": item.get("root_cause"),
+                }
+            merged.append(t)
+        return merged
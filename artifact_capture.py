@@ -1,6 +1,10 @@
 import os
+import re
+import asyncio
+from concurrent.futures import Executor
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+from typing import Optional
+from playwright.async_api import Page
 
 
 def ensure_dir(path: str):
@@ -8,24 +12,52 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
+# ASCII chars other than alphanumerics, "-" and "_" map to "_"
+_SAFE_TABLE = str.maketrans(
+    {c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c in "-_")}
+)
+_UNSAFE_RE = re.compile(r"[^\w\-]")
+
+
 def safe_filename(name: str) -> str:
     """Make a test name safe for use in file paths."""
-    return "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in name)
+    if name.isascii():
+        return name.translate(_SAFE_TABLE)
+    return _UNSAFE_RE.sub("_", name)
+
 
+def _write_text(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
 
-def capture_artifacts(url: str, run_id: str, test_name: str) -> dict:
+
+async def capture_artifacts(
+    page: Page,
+    url: str,
+    run_id: str,
+    test_name: str,
+    pool: Optional[Executor] = None,
+    skip_assets: bool = False,
+    keep_images: bool = True,
+) -> dict:
     """
     Capture artifacts (screenshot, DOM snapshot, console logs) for a test run.
-    
+    The page is owned by the caller, so one browser can be shared across tests.
+
     Args:
+        page (Page): Fresh Playwright page to run the test in.
         url (str): Target URL (game/test environment).
         run_id (str): Unique run identifier.
         test_name (str): Name of the test case.
+        pool (Executor): Executor for blocking file writes (default: loop's default executor).
+        skip_assets (bool): Abort font/media (and image, unless keep_images) requests.
+        keep_images (bool): With skip_assets, still load images so screenshots look right.
 
     Returns:
         dict: Paths to saved artifacts or error info.
     """
     artifacts = {}
+    loop = asyncio.get_running_loop()
     base_dir = os.path.join("reports", "artifacts", run_id)
     ensure_dir(base_dir)
 
@@ -33,37 +65,40 @@ def capture_artifacts(url: str, run_id: str, test_name: str) -> dict:
     safe_name = safe_filename(test_name)
     prefix = os.path.join(base_dir, safe_name)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    logs = []
+    page.on("console", lambda msg: logs.append(msg.text))
+
+    if skip_assets:
+        blocked = {"media", "font"} if keep_images else {"image", "media", "font"}
 
-        logs = []
-        page.on("console", lambda msg: logs.append(msg.text))
+        async def _filter_assets(route):
+            if route.request.resource_type in blocked:
+                await route.abort()
+            else:
+                await route.continue_()
 
-        try:
-            page.goto(url, timeout=15000)
+        await page.route("**/*", _filter_assets)
 
-            # Screenshot
-            screenshot_path = f"{prefix}_screenshot.png"
-            page.screenshot(path=screenshot_path)
-            artifacts["screenshot"] = screenshot_path
+    try:
+        # DOMContentLoaded is enough for a DOM snapshot + screenshot; don't wait on every subresource
+        await page.goto(url, timeout=15000, wait_until="domcontentloaded")
 
-            # DOM Snapshot
-            dom_path = f"{prefix}_dom.html"
-            with open(dom_path, "w", encoding="utf-8") as f:
-                f.write(page.content())
-            artifacts["dom_snapshot"] = dom_path
+        # Screenshot
+        screenshot_path = f"{prefix}_screenshot.png"
+        await page.screenshot(path=screenshot_path)
+        artifacts["screenshot"] = screenshot_path
 
-            # Console Logs
-            log_path = f"{prefix}_logs.txt"
-            with open(log_path, "w", encoding="utf-8") as f:
-                f.write("\n".join(logs))
-            artifacts["logs"] = log_path
+        # DOM Snapshot
+        dom_path = f"{prefix}_dom.html"
+        await loop.run_in_executor(pool, _write_text, dom_path, await page.content())
+        artifacts["dom_snapshot"] = dom_path
 
-        except Exception as e:
-            artifacts["error"] = str(e)
+        # Console Logs
+        log_path = f"{prefix}_logs.txt"
+        await loop.run_in_executor(pool, _write_text, log_path, "\n".join(logs))
+        artifacts["logs"] = log_path
 
-        finally:
-            browser.close()
+    except Exception as e:
+        artifacts["error"] = str(e)
 
     return artifacts
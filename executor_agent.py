@@ -1,7 +1,8 @@
 # backend/agents/executor_agent.py
 import logging
-import asyncio
-from typing import Dict, Any
+from concurrent.futures import Executor
+from typing import Dict, Any, Optional
+from playwright.async_api import Page
 from backend.utils.artifact_capture import capture_artifacts
 
 
@@ -11,12 +12,17 @@ logger = logging.getLogger("ExecutorAgent")
 class ExecutorAgent:
     """
     ExecutorAgent runs a single test case against the target game.
-    Uses Playwright to capture artifacts (screenshot, DOM snapshot, logs).
+    Uses Playwright to capture artifacts (screenshot, DOM snapshot, logs)
+    on a page provided by the OrchestratorAgent's shared browser.
     """
 
-    def __init__(self, test: Dict[str, Any], run_id: str):
+    def __init__(
+        self, test: Dict[str, Any], run_id: str, page: Page, pool: Optional[Executor] = None
+    ):
         self.test = test
         self.run_id = run_id
+        self.page = page
+        self.pool = pool
 
     async def run(self) -> Dict[str, Any]:
         """
@@ -28,10 +34,15 @@ class ExecutorAgent:
 
         logger.info("ExecutorAgent starting test %s (%s)", test_id, target_url)
 
-        # Run artifact capture in a thread (Playwright is blocking sync code)
-        loop = asyncio.get_event_loop()
-        artifacts = await loop.run_in_executor(
-            None, capture_artifacts, target_url, self.run_id, test_name
+        # Async Playwright: browser I/O interleaves on the event loop
+        artifacts = await capture_artifacts(
+            self.page,
+            target_url,
+            self.run_id,
+            test_name,
+            pool=self.pool,
+            skip_assets=self.test.get("skip_assets", False),
+            keep_images=self.test.get("screenshot", True),
         )
 
         result = {
@@ -0,0 +1,122 @@
+import re
+import json
+from typing import Any, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the agents importable without orjson
+    orjson = None
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text, with orjson when available.
+    Invalid input raises json.JSONDecodeError either way (orjson's error subclasses it).
+    """
+    if orjson is None:
+        return json.loads(text)
+    return orjson.loads(text)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string, with orjson when available.
+
+    Args:
+        obj: Value to serialize.
+        indent (bool): Pretty-print with 2-space indentation.
+
+    Returns:
+        str: JSON text.
+    """
+    if orjson is None:
+        return json.dumps(obj, indent=2 if indent else None)
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option).decode("utf-8")
+
+
+_DECODER = json.JSONDecoder()
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_START_RE = re.compile(r"[\[{]")
+_CLOSERS = {"[": "]", "{": "}"}
+
+
+def _bracket_end(text: str, start: int) -> int:
+    """End of the bracketed span opened at start (len(text) if it never closes)."""
+    stack = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in _CLOSERS:
+            stack.append(_CLOSERS[c])
+        elif stack and c == stack[-1]:
+            stack.pop()
+            if not stack:
+                return i + 1
+    return len(text)
+
+
+def _largest_json(text: str, expected: Optional[Union[type, Tuple[type, ...]]]) -> Any:
+    """
+    Decode the largest top-level '[' / '{' span in text. Starts nested inside an
+    earlier span (parsed or not) are skipped, so a broken value never yields a
+    fragment of itself, and bracketed prose like "top [3] picks" loses to the payload.
+    """
+    best = None  # (size, value, error)
+    pos = 0
+    for match in _START_RE.finditer(text):
+        start = match.start()
+        if start < pos:
+            continue
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+            error = None
+        except json.JSONDecodeError as e:
+            value, end, error = None, _bracket_end(text, start), e
+        if best is None or end - start > best[0]:
+            best = (end - start, value, error)
+        pos = end
+
+    if best is None:
+        raise json.JSONDecodeError("No JSON array or object found", text, 0)
+    _, value, error = best
+    if error is not None:
+        raise error
+    if expected is not None and not isinstance(value, expected):
+        types = expected if isinstance(expected, tuple) else (expected,)
+        names = " or ".join(t.__name__ for t in types)
+        raise json.JSONDecodeError(f"Expected JSON {names}, got {type(value).__name__}", text, 0)
+    return value
+
+
+def extract_json(text: str, expected: Optional[Union[type, Tuple[type, ...]]] = None) -> Any:
+    """
+    Parse the JSON array/object embedded in LLM output. The contents of a ``` fence
+    are preferred when present; otherwise the largest top-level JSON value in the
+    reply is used and surrounding prose is skipped.
+
+    Args:
+        text (str): Raw LLM reply.
+        expected (type): Required type of the result (e.g. list or dict).
+
+    Raises:
+        json.JSONDecodeError: If the payload is broken or not of the expected type.
+    """
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        try:
+            return _largest_json(fenced.group(1), expected)
+        except json.JSONDecodeError:
+            pass  # fall back to scanning the whole reply
+    return _largest_json(text, expected)
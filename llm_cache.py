@@ -0,0 +1,94 @@
+import os
+import json
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Optional, Protocol
+
+import aiofiles
+
+
+class LLMCache(Protocol):
+    """Storage for raw LLM response text, keyed by a hash of the request."""
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str) -> None:
+        ...
+
+
+class FileBackend:
+    """LLMCache that stores each response as reports/.llm_cache/{key}.json."""
+
+    def __init__(self, cache_dir: str = os.path.join("reports", ".llm_cache")):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            async with aiofiles.open(self._path(key), "r", encoding="utf-8") as f:
+                return json.loads(await f.read())["content"]
+        except (OSError, ValueError, KeyError):
+            # Missing or corrupt entries are treated as a miss
+            return None
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(os.makedirs, self.cache_dir, exist_ok=True)
+        async with aiofiles.open(self._path(key), "w", encoding="utf-8") as f:
+            await f.write(json.dumps({"content": value}))
+
+
+def make_key(model: str, messages: list, temperature: float) -> str:
+    """SHA-256 of the model, rendered messages, and temperature."""
+    payload = {"model": model, "messages": messages, "temperature": temperature}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+async def cached_ainvoke(
+    llm: Any,
+    prompt: Any,
+    inputs: Dict[str, Any],
+    cache: Optional[LLMCache] = None,
+    use_cache: bool = False,
+    parse: Optional[Callable[[str], Any]] = None,
+) -> Any:
+    """
+    Invoke `prompt | llm` and return the (parsed) response, going through the cache when allowed.
+    A response is only written to the cache after parse accepts it, so a truncated or
+    malformed reply is never replayed on later runs.
+
+    Args:
+        llm: LangChain chat model.
+        prompt: ChatPromptTemplate to render with inputs.
+        inputs (dict): Template variables.
+        cache (LLMCache): Cache backend; no caching when None.
+        use_cache (bool): Opt-in for caching calls with temperature > 0.
+            Calls with temperature == 0 are always cached.
+        parse (callable): Turns the response text into the result; raising rejects it.
+            Defaults to returning the text unchanged.
+
+    Returns:
+        The parse result of the response content.
+    """
+    parse = parse or (lambda text: text)
+    temperature = getattr(llm, "temperature", None)
+    if cache is None or not (temperature == 0 or use_cache):
+        response = await (prompt | llm).ainvoke(inputs)
+        return parse(response.content)
+
+    messages = [[m.type, m.content] for m in prompt.format_messages(**inputs)]
+    key = make_key(getattr(llm, "model_name", ""), messages, temperature)
+
+    hit = await cache.get(key)
+    if hit is not None:
+        try:
+            return parse(hit)
+        except Exception:
+            pass  # stale or bad entry: treat as a miss and overwrite it below
+
+    response = await (prompt | llm).ainvoke(inputs)
+    result = parse(response.content)
+    await cache.set(key, response.content)
+    return result
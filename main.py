@@ -1,34 +1,62 @@
 # backend/main.py
 import os
+import uuid
 import logging
+import importlib
+from functools import lru_cache
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
+import aiofiles
+import httpx
 
-# Load environment variables (OPENAI_API_KEY, etc.)
+from backend.utils import fast_json
+
+# Load environment variables (OPENAI_API_KEY, LLM_CACHE, etc.)
 load_dotenv()
 
-# Import agents
-try:
-    from backend.agents.planner_agent import PlannerAgent
-    from backend.agents.ranker_agent import RankerAgent
-    from backend.agents.orchestrator_agent import OrchestratorAgent
-    from backend.agents.analyzer_agent import AnalyzerAgent
-except Exception as e:
-    print("⚠️ Agent import failed:", e)
-    PlannerAgent = None
-    RankerAgent = None
-    OrchestratorAgent = None
-    AnalyzerAgent = None
+# LLM_CACHE=1 opts the agents into caching responses under reports/.llm_cache/
+LLM_CACHE = os.getenv("LLM_CACHE", "").strip().lower() in ("1", "true", "yes")
+
+# Agents are imported on first use so startup doesn't pay for LangChain/Playwright
+@lru_cache(maxsize=None)
+def _agent_class(module: str, name: str):
+    try:
+        return getattr(importlib.import_module(f"backend.agents.{module}"), name)
+    except Exception as e:
+        print("⚠️ Agent import failed:", e)
+        return None
+
+
+def _write_raw(path: str, results: List[Dict[str, Any]]):
+    """Write raw execution results as JSON lines (run as a background task)."""
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(fast_json.dumps(r) + "\n" for r in results)
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("multi-agent-game-tester")
 
-app = FastAPI(title="Multi-Agent Game Tester POC")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Created once here instead of on every /execute and /analyze request
+    os.makedirs("reports", exist_ok=True)
+
+    # One keep-alive HTTP client shared by every agent's LLM calls
+    app.state.http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    )
+    yield
+    await app.state.http_client.aclose()
+
+
+app = FastAPI(title="Multi-Agent Game Tester POC", lifespan=lifespan)
 
 # Allow frontend calls
 app.add_middleware(
@@ -61,6 +89,18 @@ class RankResponse(BaseModel):
     top_candidates: List[Dict[str, Any]]
 
 
+class PlanAndRankRequest(BaseModel):
+    target_url: str
+    seeds: Optional[List[str]] = None
+    n_candidates: Optional[int] = 20
+    top_k: Optional[int] = 10
+
+
+class PlanAndRankResponse(BaseModel):
+    candidates: List[Dict[str, Any]]
+    top_candidates: List[Dict[str, Any]]
+
+
 class ExecuteRequest(BaseModel):
     tests: List[Dict[str, Any]]
     parallelism: Optional[int] = 3
@@ -87,13 +127,14 @@ class AnalyzeResponse(BaseModel):
 @app.get("/")
 async def root():
     return {
-        "message": "✅ Multi-Agent Game Tester API is running. Endpoints: /plan, /rank, /execute, /analyze, /report/{run_id}"
+        "message": "✅ Multi-Agent Game Tester API is running. Endpoints: /plan, /rank, /plan_and_rank, /execute, /analyze, /report/{run_id}"
     }
 
 
 @app.post("/plan", response_model=PlanResponse)
 async def plan(request: PlanRequest):
     logger.info("📋 Plan request received for: %s", request.target_url)
+    PlannerAgent = _agent_class("planner_agent", "PlannerAgent")
 
     if PlannerAgent is None:
         candidates = [
@@ -107,7 +148,7 @@ async def plan(request: PlanRequest):
         ]
     else:
         try:
-            planner = PlannerAgent()
+            planner = PlannerAgent(http_client=app.state.http_client, use_cache=LLM_CACHE)
             candidates = await planner.generate(
                 request.target_url, seeds=request.seeds, n=request.n_candidates
             )
@@ -121,11 +162,12 @@ async def plan(request: PlanRequest):
 @app.post("/rank", response_model=RankResponse)
 async def rank(request: RankRequest):
     logger.info("📊 Ranking %d candidates (top %d)", len(request.candidates), request.top_k)
+    RankerAgent = _agent_class("ranker_agent", "RankerAgent")
     if RankerAgent is None:
         top = request.candidates[: request.top_k]
     else:
         try:
-            ranker = RankerAgent()
+            ranker = RankerAgent(http_client=app.state.http_client, use_cache=LLM_CACHE)
             top = await ranker.rank_and_select(request.candidates, top_k=request.top_k)
         except Exception as e:
             logger.error("❌ RankerAgent failed: %s", e)
@@ -133,11 +175,47 @@ async def rank(request: RankRequest):
     return {"top_candidates": top}
 
 
+@app.post("/plan_and_rank", response_model=PlanAndRankResponse)
+async def plan_and_rank(request: PlanAndRankRequest):
+    logger.info("📋📊 Plan+rank request for: %s (top %d of %d)",
+                request.target_url, request.top_k, request.n_candidates)
+    PlannerRankerAgent = _agent_class("planner_ranker_agent", "PlannerRankerAgent")
+
+    if PlannerRankerAgent is None:
+        candidates = [
+            {
+                "id": f"cand_{i+1}",
+                "description": f"Placeholder test #{i+1}",
+                "steps": ["Step 1", "Step 2"],
+                "expected_result": "N/A",
+            }
+            for i in range(request.n_candidates or 20)
+        ]
+        return {"candidates": candidates, "top_candidates": candidates[: request.top_k]}
+
+    try:
+        planner_ranker = PlannerRankerAgent(
+            http_client=app.state.http_client, use_cache=LLM_CACHE
+        )
+        return await planner_ranker.generate_and_rank(
+            request.target_url,
+            seeds=request.seeds,
+            n=request.n_candidates,
+            top_k=request.top_k,
+        )
+    except Exception as e:
+        logger.error("❌ PlannerRankerAgent failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/execute", response_model=ExecuteResponse)
-async def execute(request: ExecuteRequest):
-    run_id = f"run_{os.urandom(4).hex()}"
+async def execute(request: ExecuteRequest, background: BackgroundTasks):
+    run_id = f"run_{uuid.uuid4().hex[:8]}"
     logger.info("🚀 Executing %d tests (parallelism=%s) run_id=%s",
                 len(request.tests), request.parallelism, run_id)
+    OrchestratorAgent = _agent_class("orchestrator_agent", "OrchestratorAgent")
+
+    raw_path = f"reports/{run_id}_raw.jsonl"
 
     if OrchestratorAgent is None:
         results = [
@@ -154,21 +232,23 @@ async def execute(request: ExecuteRequest):
             }
             for t in request.tests
         ]
+        # Nothing to stream here; write the raw file after the response is sent
+        background.add_task(_write_raw, raw_path, results)
     else:
-        try:
-            orchestrator = OrchestratorAgent()
-            results = await orchestrator.execute_tests(
-                run_id, request.tests, parallelism=request.parallelism
-            )
-        except Exception as e:
-            logger.error("❌ OrchestratorAgent failed: %s", e)
-            raise HTTPException(status_code=500, detail=str(e))
+        # Raw results are streamed as JSON lines while tests finish
+        async with aiofiles.open(raw_path, "w", encoding="utf-8") as raw_fh:
 
-    os.makedirs("reports", exist_ok=True)
-    raw_path = f"reports/{run_id}_raw.json"
-    import json
-    with open(raw_path, "w", encoding="utf-8") as fh:
-        json.dump(results, fh, indent=2)
+            async def _append_raw(result: Dict[str, Any]):
+                await raw_fh.write(fast_json.dumps(result) + "\n")
+
+            try:
+                orchestrator = OrchestratorAgent()
+                results = await orchestrator.execute_tests(
+                    run_id, request.tests, parallelism=request.parallelism, on_result=_append_raw
+                )
+            except Exception as e:
+                logger.error("❌ OrchestratorAgent failed: %s", e)
+                raise HTTPException(status_code=500, detail=str(e))
 
     return {"run_id": run_id, "results": results}
 
@@ -177,6 +257,7 @@ async def execute(request: ExecuteRequest):
 async def analyze(request: AnalyzeRequest):
     logger.info("🔎 Analyzing run %s with %d results",
                 request.run_id, len(request.results))
+    AnalyzerAgent = _agent_class("analyzer_agent", "AnalyzerAgent")
 
     if AnalyzerAgent is None:
         report = {
@@ -198,13 +279,11 @@ async def analyze(request: AnalyzeRequest):
             ],
         }
         report_path = f"reports/{request.run_id}_report.json"
-        os.makedirs("reports", exist_ok=True)
-        import json
-        with open(report_path, "w", encoding="utf-8") as fh:
-            json.dump(report, fh, indent=2)
+        async with aiofiles.open(report_path, "w", encoding="utf-8") as fh:
+            await fh.write(fast_json.dumps(report, indent=True))
     else:
         try:
-            analyzer = AnalyzerAgent()
+            analyzer = AnalyzerAgent(http_client=app.state.http_client, use_cache=LLM_CACHE)
             report_path, report = await analyzer.analyze_and_write_report(
                 request.run_id, request.results
             )
@@ -220,6 +299,5 @@ async def get_report(run_id: str):
     path = f"reports/{run_id}_report.json"
     if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="Report not found")
-    import json
-    with open(path, "r", encoding="utf-8") as fh:
-        return json.load(fh)
+    async with aiofiles.open(path, "r", encoding="utf-8") as fh:
+        return fast_json.loads(await fh.read())
@@ -1,7 +1,10 @@
 # backend/agents/orchestrator_agent.py
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+from playwright.async_api import async_playwright
 
 from .executor_agent import ExecutorAgent
 
@@ -11,20 +14,28 @@ logger = logging.getLogger("OrchestratorAgent")
 class OrchestratorAgent:
     """
     OrchestratorAgent coordinates test execution across multiple ExecutorAgents.
+    A single Chromium instance is launched per run; each test gets its own context and page.
+    Contexts for tests sharing a target_url start from the storage state (cookies,
+    localStorage) of the first completed test against that URL.
     """
 
     def __init__(self, parallelism: int = 3):
         self.parallelism = parallelism
 
     async def execute_tests(
-        self, run_id: str, tests: List[Dict[str, Any]], parallelism: Optional[int] = None
+        self,
+        run_id: str,
+        tests: List[Dict[str, Any]],
+        parallelism: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Executes test cases in parallel batches using ExecutorAgents.
         :param run_id: Unique identifier for the run
         :param tests: List of test dictionaries
         :param parallelism: Number of parallel executors
-        :return: List of execution results
+        :param on_result: Optional coroutine callback awaited with each result as soon as its test finishes
+        :return: List of execution results, in the same order as tests
         """
         parallelism = parallelism or self.parallelism
         logger.info(
@@ -36,13 +47,47 @@ class OrchestratorAgent:
 
         sem = asyncio.Semaphore(parallelism)
 
-        async def _bounded_exec(test: Dict[str, Any]) -> Dict[str, Any]:
-            async with sem:
-                executor = ExecutorAgent(test, run_id)
-                return await executor.run()
+        # Schedule same-URL tests back-to-back so the warm storage state gets reused
+        group_rank: Dict[Any, int] = {}
+        for t in tests:
+            group_rank.setdefault(t.get("target_url"), len(group_rank))
+        order = sorted(range(len(tests)), key=lambda i: group_rank[tests[i].get("target_url")])
+        storage_states: Dict[Any, Dict[str, Any]] = {}
+
+        # Artifact writes go to a pool sized to parallelism, not the loop's default executor
+        with ThreadPoolExecutor(max_workers=parallelism) as pool:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+
+                async def _bounded_exec(test: Dict[str, Any]) -> Dict[str, Any]:
+                    url = test.get("target_url")
+                    async with sem:
+                        ctx = await browser.new_context(storage_state=storage_states.get(url))
+                        try:
+                            page = await ctx.new_page()
+                            executor = ExecutorAgent(test, run_id, page, pool=pool)
+                            result = await executor.run()
+                            if url not in storage_states and result["status"] == "completed":
+                                storage_states[url] = await ctx.storage_state()
+                            return result
+                        finally:
+                            await ctx.close()
 
-        # Run all tests concurrently with bounded parallelism
-        results = await asyncio.gather(*[_bounded_exec(t) for t in tests])
+                # Run all tests concurrently with bounded parallelism,
+                # handing each result off as soon as it completes
+                tasks = {i: asyncio.create_task(_bounded_exec(tests[i])) for i in order}
+                try:
+                    for fut in asyncio.as_completed(tasks.values()):
+                        result = await fut
+                        if on_result is not None:
+                            await on_result(result)
+                    results = [tasks[i].result() for i in range(len(tests))]
+                finally:
+                    # On the first failure, cancel the rest and let the original exception propagate
+                    for t in tasks.values():
+                        t.cancel()
+                    await asyncio.gather(*tasks.values(), return_exceptions=True)
+                    await browser.close()
 
         logger.info("Completed execution of %d tests", len(results))
         return results
@@ -4,9 +4,13 @@ from typing import List, Dict, Any, Optional
 import json
 import os
 
-from langchain_community.chat_models import ChatOpenAI
+import httpx
+from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
+from backend.utils import fast_json
+from backend.utils.llm_cache import LLMCache, FileBackend, cached_ainvoke
+
 logger = logging.getLogger("PlannerAgent")
 
 
@@ -16,7 +20,14 @@ class PlannerAgent:
     It uses an LLM via LangChain to propose structured, real-world QA test scenarios.
     """
 
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.5):
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.5,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         # ✅ Load API key from environment (recommended) or hardcode for testing
         self.api_key = ""
 
@@ -29,7 +40,11 @@ class PlannerAgent:
             model=model_name,
             temperature=temperature,
             api_key=self.api_key,
+            http_async_client=http_client,
         )
+        # Responses are cached when temperature == 0, or always with use_cache=True
+        self.cache = cache or FileBackend()
+        self.use_cache = use_cache
 
     async def generate(
         self,
@@ -70,23 +85,16 @@ class PlannerAgent:
             ]
         )
 
-        chain = prompt | self.llm
-
         try:
-            response = await chain.ainvoke({})
-            text = response.content.strip()
-
-            # ✅ Fix common LLM formatting issues
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].strip()
-
-            candidates = json.loads(text)
-
-            # ✅ Ensure list format
-            if isinstance(candidates, dict):
-                candidates = [candidates]
+            # ✅ Tolerates ```json fences and stray prose around the JSON
+            candidates = await cached_ainvoke(
+                self.llm,
+                prompt,
+                {},
+                cache=self.cache,
+                use_cache=self.use_cache,
+                parse=lambda text: fast_json.extract_json(text, expected=list),
+            )
 
             logger.info("✅ Generated %d candidate test cases", len(candidates))
             return candidates
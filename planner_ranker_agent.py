@@ -0,0 +1,130 @@
+# backend/agents/planner_ranker_agent.py
+import logging
+from typing import List, Dict, Any, Optional
+import json
+
+import httpx
+from langchain_openai import ChatOpenAI
+from langchain.prompts import ChatPromptTemplate
+
+from backend.utils import fast_json
+from backend.utils.llm_cache import LLMCache, FileBackend, cached_ainvoke
+
+logger = logging.getLogger("PlannerRankerAgent")
+
+
+class PlannerRankerAgent:
+    """
+    PlannerRankerAgent generates candidate test cases for play.ezygamers.com and
+    selects the top_k most useful in a single LLM call (Planner + Ranker fused).
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.5,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        # --- Directly set your API key here ---
+        self.api_key = ""
+
+        if not self.api_key:
+            raise RuntimeError("❌ OPENAI_API_KEY not found.")
+
+        self.llm = ChatOpenAI(
+            model=model_name,
+            temperature=temperature,
+            api_key=self.api_key,
+            http_async_client=http_client,
+        )
+        self.cache = cache or FileBackend()
+        self.use_cache = use_cache
+
+    async def generate_and_rank(
+        self,
+        target_url: str,
+        seeds: Optional[List[str]] = None,
+        n: int = 20,
+        top_k: int = 10,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Generate n candidate test cases and rank them in one round trip.
+        :param target_url: Target web app URL
+        :param seeds: Optional seed ideas (user-provided)
+        :param n: Number of candidate test cases to generate
+        :param top_k: Number of candidates to select
+        :return: {"candidates": [...], "top_candidates": [...]}
+        """
+        logger.info(
+            "PlannerRankerAgent generating %d test cases for %s; selecting top %d",
+            n, target_url, top_k,
+        )
+
+        prompt = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    "You are an experienced QA test planner and strategist for online puzzle/gaming "
+                    "platforms. You generate **realistic, structured test cases** for the website "
+                    "'https://play.ezygamers.com' (login, user onboarding, gameplay flow, leaderboards, "
+                    "rewards, responsiveness, edge cases) and rank them by importance, coverage, and "
+                    "ability to find bugs."
+                ),
+                (
+                    "user",
+                    "Target: {target_url}\n"
+                    "Seeds (optional): {seeds}\n\n"
+                    "Generate {n} unique test cases. Each test case **must** have the fields:\n"
+                    "- id: short unique identifier\n"
+                    "- description: what the test verifies\n"
+                    "- steps: ordered list of steps a tester should follow\n"
+                    "- expected_result: the expected outcome if the site is working correctly\n\n"
+                    "Then select the top {top_k} most promising ones.\n"
+                    'Return ONLY a valid JSON object: {{"candidates": [...], "top_k": [ids of the '
+                    "selected test cases, best first]}}. No explanations or commentary."
+                ),
+            ]
+        )
+
+        try:
+            data = await cached_ainvoke(
+                self.llm,
+                prompt,
+                {"target_url": target_url, "seeds": seeds or "none", "n": n, "top_k": top_k},
+                cache=self.cache,
+                use_cache=self.use_cache,
+                parse=lambda text: fast_json.extract_json(text, expected=(dict, list)),
+            )
+            if isinstance(data, list):
+                # Model returned a bare candidates array: keep it, with no ranking
+                data = {"candidates": data, "top_k": []}
+            candidates = data.get("candidates", [])
+            if not isinstance(candidates, list):
+                raise json.JSONDecodeError("'candidates' is not a JSON array", str(data), 0)
+            top_ids = data.get("top_k")
+            if not isinstance(top_ids, list):
+                top_ids = []
+            # Compare ids as strings: the model may return 1 where the candidate id is "1"
+            by_id = {str(c.get("id")): c for c in candidates if isinstance(c, dict)}
+            top_candidates = [by_id[str(i)] for i in top_ids if str(i) in by_id][:top_k]
+            if not top_candidates and candidates:
+                logger.warning(
+                    "⚠️ None of the LLM's top_k ids matched a candidate; using the first %d",
+                    top_k,
+                )
+                top_candidates = candidates[:top_k]
+
+            logger.info(
+                "✅ Generated %d candidates, selected %d", len(candidates), len(top_candidates)
+            )
+            return {"candidates": candidates, "top_candidates": top_candidates}
+
+        except json.JSONDecodeError as je:
+            logger.error("❌ Failed to parse LLM output as JSON: %s", je)
+            raise RuntimeError("PlannerRankerAgent failed to parse JSON output from LLM") from je
+
+        except Exception as e:
+            logger.error("❌ PlannerRankerAgent LLM failed: %s", e)
+            raise RuntimeError("PlannerRankerAgent failed to generate and rank test cases") from e
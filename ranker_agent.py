@@ -1,12 +1,15 @@
 # backend/agents/ranker_agent.py
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
-import re
 
+import httpx
 from langchain_openai import ChatOpenAI   # ✅ use correct package
 from langchain.prompts import ChatPromptTemplate
 
+from backend.utils import fast_json
+from backend.utils.llm_cache import LLMCache, FileBackend, cached_ainvoke
+
 logger = logging.getLogger("RankerAgent")
 
 
@@ -16,7 +19,14 @@ class RankerAgent:
     Uses an LLM via LangChain.
     """
 
-    def __init__(self, model_name: str = "gpt-4o-mini", temperature: float = 0.3):
+    def __init__(
+        self,
+        model_name: str = "gpt-4o-mini",
+        temperature: float = 0.3,
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = False,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         # --- Directly set your API key here ---
         self.api_key = ""
 
@@ -27,7 +37,10 @@ class RankerAgent:
             model=model_name,
             temperature=temperature,
             api_key=self.api_key,
+            http_async_client=http_client,
         )
+        self.cache = cache or FileBackend()
+        self.use_cache = use_cache
 
     async def rank_and_select(
         self, candidates: List[Dict[str, Any]], top_k: int = 10
@@ -52,35 +65,27 @@ class RankerAgent:
             ]
         )
 
-        chain = prompt | self.llm
-
-        try:
-            response = await chain.ainvoke({
-                "candidates": json.dumps(candidates, indent=2),
-                "top_k": top_k
-            })
-
-            text = response.content.strip()
+        def _parse(text: str) -> List[Dict[str, Any]]:
+            text = text.strip()
             if not text:
                 raise ValueError("LLM returned empty response")
 
-            # --- Clean JSON if wrapped in ```json ... ``` ---
-            if text.startswith("```"):
-                text = re.sub(r"^```(json)?", "", text)
-                text = re.sub(r"```$", "", text).strip()
-
-            # --- Try to parse JSON ---
+            # --- Parse the JSON, skipping ``` fences or prose around it ---
             try:
-                top_candidates = json.loads(text)
+                return fast_json.extract_json(text, expected=list)
             except json.JSONDecodeError:
                 logger.error("LLM output was not valid JSON:\n%s", text)
                 raise
 
-            # Ensure a list is returned
-            if isinstance(top_candidates, dict):
-                top_candidates = [top_candidates]
-
-            return top_candidates
+        try:
+            return await cached_ainvoke(
+                self.llm,
+                prompt,
+                {"candidates": fast_json.dumps(candidates, indent=True), "top_k": top_k},
+                cache=self.cache,
+                use_cache=self.use_cache,
+                parse=_parse,
+            )
 
         except Exception as e:
             logger.error("❌ RankerAgent LLM failed: %s", e)
@@ -1,6 +1,12 @@
 import os
-import json
+import asyncio
+from collections import Counter
 from datetime import datetime
+from typing import Tuple
+
+import aiofiles
+
+from . import fast_json
 
 
 def ensure_dir(path: str):
@@ -8,7 +14,7 @@ def ensure_dir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
-def generate_report(run_id: str, test_results: list, artifacts: dict, notes: str = "") -> str:
+async def generate_report(run_id: str, test_results: list, artifacts: dict, notes: str = "") -> Tuple[str, dict]:
     """
     Generate a structured JSON report for a test run.
 
@@ -19,18 +25,20 @@ def generate_report(run_id: str, test_results: list, artifacts: dict, notes: str
         notes (str): Optional triage notes.
 
     Returns:
-        str: Path to the generated JSON report.
+        tuple: (path to the generated JSON report, report data as written).
     """
     report_dir = "reports"
     ensure_dir(report_dir)
 
+    verdicts = Counter(r.get("verdict") for r in test_results)
     report_data = {
         "run_id": run_id,
         "timestamp": datetime.utcnow().isoformat(),
         "summary": {
             "total_tests": len(test_results),
-            "passed": sum(1 for r in test_results if r.get("status") == "passed"),
-            "failed": sum(1 for r in test_results if r.get("status") == "failed"),
+            "passed": verdicts.get("passed", 0),
+            "failed": verdicts.get("failed", 0),
+            "flaky": verdicts.get("flaky", 0),
         },
         "results": test_results,
         "artifacts": artifacts,
@@ -38,7 +46,9 @@ def generate_report(run_id: str, test_results: list, artifacts: dict, notes: str
     }
 
     report_path = os.path.join(report_dir, f"{run_id}_report.json")
-    with open(report_path, "w", encoding="utf-8") as f:
-        json.dump(report_data, f, indent=2)
+    # Serialize off the event loop, then write without blocking it
+    text = await asyncio.to_thread(fast_json.dumps, report_data, True)
+    async with aiofiles.open(report_path, "w", encoding="utf-8") as f:
+        await f.write(text)
 
-    return report_path
+    return report_path, report_data